@@ -0,0 +1,43 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import tempfile
+from cryptography.hazmat.primitives.asymmetric import rsa
+from kalshi_client.client import KalshiClient
+from kalshi_client.transport import RecordedResponse, RecordingTransport, ReplayTransport, Transport
+
+
+class EchoTransport(Transport):
+    """Stands in for the exchange, answering every request with what was asked for."""
+    def request(self, method, url, headers=None, params=None, data=None):
+        return RecordedResponse(200, 'OK', {'method': method, 'url': url, 'params': params, 'data': data})
+
+
+def record(client):
+    """Calls made while recording and again while replaying, which must return the same responses."""
+    return [
+        client.get_balance(),
+        client.get_events(limit=5, status='open'),
+        client.get_markets(limit=100, cursor='a+b/c=', event_ticker='EVENT'),
+        client.get_orderbook('MARKET', depth=10),
+        client.get_trades(ticker='MARKET', limit=50),
+        client.get_fills(ticker='MARKET'),
+        client.get_positions(count_filter='position'),
+    ]
+
+
+if __name__ == "__main__":
+
+    # Uses a throwaway key, since no request ever leaves this process
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path = os.path.join(tempfile.mkdtemp(), 'recording.zip')
+
+    # Record with one client, then replay with a new one, so nothing tied to
+    # the client instance may end up in the archive keys
+    with RecordingTransport(path, EchoTransport()) as transport:
+        recorded = record(KalshiClient(key_id="your key id", private_key=private_key, transport=transport))
+    replayed = record(KalshiClient(key_id="your key id", private_key=None, transport=ReplayTransport(path)))
+
+    os.remove(path)
+    if recorded != replayed:
+        sys.exit('Replayed responses differ from the recorded ones')
+    print(f'Replayed {len(replayed)} recorded calls')
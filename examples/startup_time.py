@@ -0,0 +1,74 @@
+import sys, os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import subprocess
+import tempfile
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# Startup budget for a simple get_balance script, from the first import until its response
+# is returned. The call is answered by a stub instead of the network, but is still signed and
+# still creates the requests session, so it pays every startup cost a real first call does.
+# Importing requests alone takes about 70 ms of this, which lazy imports only defer to the
+# first request, so the check currently sits above the budget, at about 120 ms here.
+STARTUP_BUDGET_MS = 100
+
+# Runs in a fresh interpreter so nothing is already imported
+STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from kalshi_client.client import KalshiClient
+from kalshi_client.transport import RecordedResponse, SessionTransport
+from kalshi_client.utils import load_private_key_from_file
+
+class StubTransport(SessionTransport):
+    # Creates the session like a real first request, then answers without sending anything
+    def request(self, method, url, headers=None, params=None, data=None):
+        self.session
+        return RecordedResponse(200, 'OK', {{'balance': 0}})
+
+kalshi_client = KalshiClient(key_id="your key id", private_key=load_private_key_from_file({key_path!r}),
+                             transport=StubTransport())
+kalshi_client.get_balance()
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def measure_startup_ms(key_path, runs=5):
+    """
+    Measure the fastest of several cold starts of a get_balance script, in milliseconds.
+
+    :param key_path: Path of the private key the client is created with
+    :param runs: Number of fresh interpreters to start (default is 5)
+    :return: Fastest startup time in milliseconds
+    """
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    script = STARTUP_SCRIPT.format(root=root, key_path=key_path)
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', script], check=True,
+                                capture_output=True, text=True).stdout
+        timings.append(float(output))
+    return min(timings)
+
+
+if __name__ == "__main__":
+
+    # Uses a throwaway key, since no request is ever sent
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with tempfile.NamedTemporaryFile('wb', suffix='.txt', delete=False) as key_file:
+        key_file.write(private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.TraditionalOpenSSL,
+            encryption_algorithm=serialization.NoEncryption(),
+        ))
+
+    try:
+        startup_ms = measure_startup_ms(key_file.name)
+    finally:
+        os.remove(key_file.name)
+
+    print(f'Startup took {startup_ms:.1f} ms (budget {STARTUP_BUDGET_MS} ms)')
+
+    # Exit non-zero so this can be run as a regression check
+    sys.exit(0 if startup_ms <= STARTUP_BUDGET_MS else 1)
@@ -1,18 +1,23 @@
 import json
-from typing import Optional
-from cryptography.hazmat.primitives.asymmetric import rsa
+from typing import Optional, TYPE_CHECKING
 from kalshi_client.connector import Connector
+from kalshi_client.transport import Transport
+
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.asymmetric import rsa
 
 
 class KalshiClient(Connector):
-    def __init__(self, key_id: str, private_key: rsa.RSAPrivateKey, 
+    def __init__(self, key_id: str, private_key: "rsa.RSAPrivateKey", 
                  exchange_api_base: str = 'https://api.elections.kalshi.com/trade-api/v2',
-                 rate_limit: int = 10):
+                 rate_limit: int = 10,
+                 transport: Optional[Transport] = None):
         super().__init__(
             exchange_api_base,
             key_id,
             private_key,
-            rate_limit
+            rate_limit,
+            transport=transport
         )
         """
         Initializes the KalshiClient.
@@ -22,6 +27,7 @@ class KalshiClient(Connector):
             private_key (rsa.RSAPrivateKey): The private key for the client.
             exchange_api_base (str, optional): The base URL for the Kalshi API. Defaults to 'https://api.elections.kalshi.com/trade-api/v2'.
             rate_limit (int, optional): The rate limit for the client (per second). Defaults to 10.
+            transport (Optional[Transport], optional): Sends the client's requests, e.g. a RecordingTransport or ReplayTransport. Defaults to a SessionTransport.
         """
         self.key_id = key_id
         self.private_key = private_key
@@ -123,9 +129,8 @@ class KalshiClient(Connector):
         Returns:
             dict: A dictionary containing the retrieved event and associated metadata
         """
-        if with_nested_markets is not None:
-            return self.get(f'{self.events_url}/{event_ticker}?with_nested_markets={with_nested_markets}')
-        return self.get(f'{self.events_url}/{event_ticker}')
+        query_string = self.query_generation({'with_nested_markets': with_nested_markets})
+        return self.get(f'{self.events_url}/{event_ticker}{query_string}')
 
     def get_series(self, 
                     series_ticker:str):
@@ -188,13 +193,6 @@ class KalshiClient(Connector):
                     ):
         
         query_string = self.query_generation(locals())
-        if ticker:
-            if len(query_string):
-                query_string += '&'
-            else:
-                query_string += '?'
-            query_string += "ticker=" + ticker
-            
         trades_url = self.markets_url + '/trades'
         dictr = self.get(trades_url + query_string)
         return dictr
@@ -1,13 +1,33 @@
-import requests
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, TYPE_CHECKING
 from datetime import datetime
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
-from cryptography.exceptions import InvalidSignature
+from functools import lru_cache
 import time 
 import base64
+from urllib.parse import urlencode
 from kalshi_client.http_helpers import HttpError
+from kalshi_client.transport import Transport, SessionTransport
+from kalshi_client.utils import lazy_import
+
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+# The cryptography stack is only loaded once the first request is signed
+hashes = lazy_import("cryptography.hazmat.primitives.hashes")
+padding = lazy_import("cryptography.hazmat.primitives.asymmetric.padding")
+exceptions = lazy_import("cryptography.exceptions")
+
+
+@lru_cache(maxsize=None)
+def pss_signing_params():
+    """Build the PSS padding and hash used for every signature once, and reuse them."""
+    return (
+        padding.PSS(
+            mgf=padding.MGF1(hashes.SHA256()),
+            salt_length=padding.PSS.DIGEST_LENGTH
+        ),
+        hashes.SHA256()
+    )
 
 
 class Connector:
@@ -16,27 +36,32 @@ class Connector:
         self,
         host: str,
         key_id: str,
-        private_key: rsa.RSAPrivateKey,
+        private_key: "rsa.RSAPrivateKey",
         rate_limit = 10,
         user_id: Optional[str] = None,
+        transport: Optional[Transport] = None,
     ):
         """Initializes the client and logs in the specified user.
+        Requests are sent through `transport`, which defaults to a SessionTransport.
         Raises an HttpError if the user could not be authenticated.
         """
         self.host = host 
         self.key_id: str = key_id
         self.user_id = user_id
-        self.private_key: rsa.RSAPrivateKey = private_key
+        self.private_key: "rsa.RSAPrivateKey" = private_key
         self.threshold = 1 / rate_limit
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json",
+        self.transport = transport if transport is not None else SessionTransport()
+        self.transport.headers.update({"Content-Type": "application/json",
                                      "KALSHI-ACCESS-KEY": self.key_id,})
-        self.last_api_call = datetime.now()
+        # No call has been made yet, so the first one is never delayed
+        self.last_api_call = datetime.min
 
     """Built in rate-limiter. We STRONGLY encourage you to keep 
     some sort of rate limiting, just in case there is a bug in your 
     code. Feel free to adjust the threshold"""
     def rate_limit(self) -> None:
+        if not self.transport.live:
+            return
 
         # Check if the time since the last API call is below the threshold
         elapsed_time = (datetime.now() - self.last_api_call).total_seconds()
@@ -53,8 +78,8 @@ class Connector:
         """
         self.rate_limit()
 
-        response = self.session.post(
-            self.host + path, data=body, headers=self.request_headers("POST", path)
+        response = self.transport.request(
+            "POST", self.host + path, data=body, headers=self.request_headers("POST", path)
         )
         self.raise_if_bad_response(response)
         return response.json()
@@ -64,24 +89,28 @@ class Connector:
         Returns the response body. Raises an HttpError on non-2XX results."""
         self.rate_limit()
         
-        response = self.session.get(
-            self.host + path, headers=self.request_headers("GET", path), params=params
+        response = self.transport.request(
+            "GET", self.host + path, headers=self.request_headers("GET", path), params=params
         )
         self.raise_if_bad_response(response)
         return response.json()
 
-    def delete(self, path: str, params: Dict[str, Any] = {}) -> Any:
+    def delete(self, path: str, params: Dict[str, Any] = {}, body: Optional[str] = None) -> Any:
         """Posts from an authenticated Kalshi HTTP endpoint.
         Returns the response body. Raises an HttpError on non-2XX results."""
         self.rate_limit()
         
-        response = self.session.delete(
-            self.host + path, headers=self.request_headers("DELETE", path), params=params
+        response = self.transport.request(
+            "DELETE", self.host + path, headers=self.request_headers("DELETE", path), params=params, data=body
         )
         self.raise_if_bad_response(response)
         return response.json()
 
     def request_headers(self, method: str, path: str) -> Dict[str, Any]:
+        # Offline transports never reach the exchange, so there is nothing to sign
+        if not self.transport.live:
+            return {}
+
         # Generate the current timestamp in milliseconds
         timestampt_str = str(int(datetime.now().timestamp() * 1000))
 
@@ -108,19 +137,12 @@ class Connector:
         # Convert the text to bytes
         message = text.encode('utf-8')
         try:
-            signature = self.private_key.sign(
-                message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.DIGEST_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            signature = self.private_key.sign(message, *pss_signing_params())
             return base64.b64encode(signature).decode('utf-8')
-        except InvalidSignature as e:
+        except exceptions.InvalidSignature as e:
             raise ValueError("RSA sign PSS failed") from e
 
-    def raise_if_bad_response(self, response: requests.Response) -> None:
+    def raise_if_bad_response(self, response: Any) -> None:
         if response.status_code not in range(200, 299):
             if response.status_code == 404:
                 raise HttpError(response.reason, response.status_code, tip='Check ticker used for call if one was provided')
@@ -132,6 +154,7 @@ class Connector:
     def query_generation(self, params:dict) -> str:
         """
         Generate a URL query string from a dictionary of parameters.
+        `self` is skipped, so endpoints can pass their `locals()` straight in.
         """
-        query = '&'.join(f'{str(k)}={str(v)}' for k, v in params.items() if v)
+        query = urlencode([(k, v) for k, v in params.items() if v and k != 'self'])
         return f'?{query}' if query else ''
\ No newline at end of file
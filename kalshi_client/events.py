@@ -0,0 +1,116 @@
+from typing import Dict, Iterator, List, Optional
+from kalshi_client.client import KalshiClient
+
+
+class EventLoader:
+    """Loads events together with their markets and caches the results.
+
+    Every event is fetched with nested markets, so a multi-outcome event
+    takes one request instead of one `get_event` plus a `get_market` per ticker.
+    """
+    def __init__(self, client: KalshiClient, page_size: int = 200):
+        """
+        Initializes the EventLoader.
+
+        Args:
+            client (KalshiClient): The client used to call the API.
+            page_size (int, optional): Number of events requested per page when paging through `get_events`. Defaults to 200.
+        """
+        self.client = client
+        self.page_size = page_size
+        self.events: Dict[str, dict] = {}
+
+    def load_event(self, event_ticker: str, refresh: bool = False) -> dict:
+        """
+        Load a single event and its markets in one request.
+
+        Args:
+            event_ticker (str): The event ticker.
+            refresh (bool, optional): If `True`, ignores any cached copy of the event. Defaults to False.
+
+        Returns:
+            dict: The normalized event, see `normalize_event`.
+        """
+        if refresh or event_ticker not in self.events:
+            response = self.client.get_event(event_ticker, with_nested_markets=True)
+            self.cache(normalize_event(response['event'], response.get('markets')))
+        return self.events[event_ticker]
+
+    def iter_events(self,
+                    series_ticker: Optional[str] = None,
+                    status: Optional[str] = None,
+                    ) -> Iterator[dict]:
+        """
+        Page through `get_events` with nested markets, caching and yielding each event.
+
+        Args:
+            series_ticker (Optional[str], optional): Filters events by the specified series ticker. Defaults to None.
+            status (Optional[str], optional): Filters events by their status. Valid values include: `unopened`, `open`, `closed`, `settled`. Defaults to None.
+
+        Yields:
+            dict: Normalized events, see `normalize_event`.
+        """
+        cursor = None
+        while True:
+            page = self.client.get_events(limit=self.page_size,
+                                          cursor=cursor,
+                                          series_ticker=series_ticker,
+                                          status=status,
+                                          with_nested_markets=True)
+            for event in page.get('events') or []:
+                yield self.cache(normalize_event(event))
+            cursor = page.get('cursor')
+            if not cursor:
+                break
+
+    def load_series(self,
+                    series_ticker: str,
+                    status: Optional[str] = None,
+                    ) -> Dict[str, dict]:
+        """
+        Load every event in a series together with its markets.
+
+        Args:
+            series_ticker (str): The series ticker.
+            status (Optional[str], optional): Filters events by their status. Defaults to None.
+
+        Returns:
+            dict: Normalized events keyed by event ticker.
+        """
+        return {event['event_ticker']: event for event in self.iter_events(series_ticker, status)}
+
+    def get_markets(self, event_ticker: str) -> List[dict]:
+        """
+        Get the markets of an event, loading the event if it is not cached.
+
+        Args:
+            event_ticker (str): The event ticker.
+
+        Returns:
+            list: The markets of the event.
+        """
+        return list(self.load_event(event_ticker)['markets'].values())
+
+    def cache(self, event: dict) -> dict:
+        self.events[event['event_ticker']] = event
+        return event
+
+    def clear(self) -> None:
+        self.events.clear()
+
+
+def normalize_event(event: dict, markets: Optional[list] = None) -> dict:
+    """
+    Normalize an event payload into an event -> markets structure.
+
+    Args:
+        event (dict): The event as returned by `get_event` or `get_events`.
+        markets (Optional[list], optional): Markets returned alongside the event, used when they are not nested in it. Defaults to None.
+
+    Returns:
+        dict: The event fields with `markets` replaced by a dictionary of markets keyed by ticker.
+    """
+    normalized = dict(event)
+    nested = normalized.pop('markets', None) or markets or []
+    normalized['markets'] = {market['ticker']: market for market in nested}
+    return normalized
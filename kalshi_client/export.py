@@ -0,0 +1,238 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from kalshi_client.client import KalshiClient
+from kalshi_client.utils import lazy_import
+
+# pyarrow is an optional dependency, only loaded once something is exported
+pa = lazy_import('pyarrow')
+
+
+"""
+Streams paginated endpoint results into Arrow record batches with a fixed
+schema per endpoint, and writes them to Arrow IPC or Parquet files one page
+at a time, so memory stays bounded by the page size however large the export.
+"""
+
+_OHLC = ('open', 'high', 'low', 'close')
+
+# Field name and type of every column, per endpoint. Timestamps are parsed from
+# the API's ISO 8601 strings, and structs hold the nested candlestick prices
+FIELDS: Dict[str, List[tuple]] = {
+    'markets': [
+        ('ticker', 'string'), ('event_ticker', 'string'), ('market_type', 'string'),
+        ('title', 'string'), ('subtitle', 'string'), ('status', 'string'),
+        ('open_time', 'timestamp'), ('close_time', 'timestamp'), ('expiration_time', 'timestamp'),
+        ('yes_bid', 'int64'), ('yes_ask', 'int64'), ('no_bid', 'int64'), ('no_ask', 'int64'),
+        ('last_price', 'int64'), ('previous_price', 'int64'), ('volume', 'int64'),
+        ('volume_24h', 'int64'), ('open_interest', 'int64'), ('liquidity', 'int64'),
+        ('result', 'string'),
+    ],
+    'trades': [
+        ('trade_id', 'string'), ('ticker', 'string'), ('count', 'int64'),
+        ('yes_price', 'int64'), ('no_price', 'int64'), ('taker_side', 'string'),
+        ('created_time', 'timestamp'),
+    ],
+    'fills': [
+        ('trade_id', 'string'), ('order_id', 'string'), ('ticker', 'string'),
+        ('side', 'string'), ('action', 'string'), ('count', 'int64'),
+        ('yes_price', 'int64'), ('no_price', 'int64'), ('is_taker', 'bool'),
+        ('created_time', 'timestamp'), ('ts', 'int64'),
+    ],
+    # Matches the candlestick dicts the functions in technical.py expect
+    'candlesticks': [
+        ('end_period_ts', 'int64'),
+        ('price', ('struct', _OHLC + ('mean', 'previous'))),
+        ('yes_bid', ('struct', _OHLC)),
+        ('yes_ask', ('struct', _OHLC)),
+        ('volume', 'int64'),
+        ('open_interest', 'int64'),
+    ],
+}
+
+
+def _arrow_type(kind):
+    if isinstance(kind, tuple):
+        return pa.struct([(name, pa.int64()) for name in kind[1]])
+    if kind == 'timestamp':
+        return pa.timestamp('us', tz='UTC')
+    return getattr(pa, kind)()
+
+
+@lru_cache(maxsize=None)
+def schema(endpoint: str) -> "pa.Schema":
+    """
+    Get the fixed Arrow schema of an endpoint's export.
+
+    Args:
+        endpoint (str): One of `markets`, `trades`, `fills` or `candlesticks`.
+
+    Returns:
+        pa.Schema: The schema every record batch of the endpoint follows.
+    """
+    return pa.schema([(name, _arrow_type(kind)) for name, kind in FIELDS[endpoint]])
+
+
+def to_record_batch(endpoint: str, rows: List[dict]) -> "pa.RecordBatch":
+    """
+    Convert one page of results into a record batch, column by column.
+    Missing fields become nulls and fields outside the schema are dropped.
+    """
+    columns = []
+    for field in schema(endpoint):
+        values = [row.get(field.name) for row in rows]
+        if pa.types.is_timestamp(field.type):
+            columns.append(pa.array(values, type=pa.string()).cast(field.type))
+        else:
+            columns.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(columns, schema=schema(endpoint))
+
+
+def _iter_pages(fetch: Callable[[Optional[str]], dict], key: str) -> Iterator[List[dict]]:
+    cursor = None
+    while True:
+        page = fetch(cursor)
+        rows = page.get(key) or []
+        if rows:
+            yield rows
+        cursor = page.get('cursor')
+        if not cursor:
+            break
+
+
+def iter_market_batches(client: KalshiClient, limit: int = 1000, **filters) -> Iterator["pa.RecordBatch"]:
+    """
+    Page through `get_markets`, yielding one record batch per page.
+
+    Args:
+        client (KalshiClient): The client used to call the API.
+        limit (int, optional): Number of markets per page. Defaults to 1000.
+        **filters: Filters passed on to `get_markets`, e.g. `status` or `series_ticker`.
+    """
+    for rows in _iter_pages(lambda cursor: client.get_markets(limit=limit, cursor=cursor, **filters), 'markets'):
+        yield to_record_batch('markets', rows)
+
+
+def iter_trade_batches(client: KalshiClient, limit: int = 1000, **filters) -> Iterator["pa.RecordBatch"]:
+    """
+    Page through `get_trades`, yielding one record batch per page.
+
+    Args:
+        client (KalshiClient): The client used to call the API.
+        limit (int, optional): Number of trades per page. Defaults to 1000.
+        **filters: Filters passed on to `get_trades`, e.g. `ticker`, `min_ts` or `max_ts`.
+    """
+    for rows in _iter_pages(lambda cursor: client.get_trades(limit=limit, cursor=cursor, **filters), 'trades'):
+        yield to_record_batch('trades', rows)
+
+
+def iter_fill_batches(client: KalshiClient, limit: int = 1000, **filters) -> Iterator["pa.RecordBatch"]:
+    """
+    Page through `get_fills`, yielding one record batch per page.
+
+    Args:
+        client (KalshiClient): The client used to call the API.
+        limit (int, optional): Number of fills per page. Defaults to 1000.
+        **filters: Filters passed on to `get_fills`, e.g. `ticker`, `order_id`, `min_ts` or `max_ts`.
+    """
+    for rows in _iter_pages(lambda cursor: client.get_fills(limit=limit, cursor=cursor, **filters), 'fills'):
+        yield to_record_batch('fills', rows)
+
+
+def iter_candlestick_batches(client: KalshiClient,
+                             ticker: str,
+                             series_ticker: str,
+                             start_ts: int,
+                             end_ts: int,
+                             period_interval: int,
+                             periods_per_request: int = 5000) -> Iterator["pa.RecordBatch"]:
+    """
+    Split a time range into windows of `periods_per_request` candlesticks and
+    yield one record batch per `get_market_candlesticks` call.
+
+    Args:
+        client (KalshiClient): The client used to call the API.
+        ticker (str): The market ticker.
+        series_ticker (str): The series ticker.
+        start_ts (int): The start timestamp in unix seconds.
+        end_ts (int): The end timestamp in unix seconds.
+        period_interval (int): Length of each candlestick period, in minutes.
+        periods_per_request (int, optional): Number of candlesticks requested per call. Defaults to 5000.
+    """
+    window = periods_per_request * period_interval * 60
+    while start_ts <= end_ts:
+        window_end = min(start_ts + window - 1, end_ts)
+        rows = client.get_market_candlesticks(ticker, series_ticker, start_ts, window_end,
+                                              period_interval).get('candlesticks') or []
+        if rows:
+            yield to_record_batch('candlesticks', rows)
+        # Both ends of a window are inclusive, so the next one starts just after it
+        start_ts = window_end + 1
+
+
+def write_batches(batches: Iterator["pa.RecordBatch"], path: str, endpoint: str, format: Optional[str] = None) -> int:
+    """
+    Write record batches to a file as they arrive.
+
+    Args:
+        batches (Iterator[pa.RecordBatch]): Batches following the endpoint's schema.
+        path (str): The file to write.
+        endpoint (str): The endpoint the batches came from, which selects the schema.
+        format (Optional[str], optional): `parquet` or `arrow`. Defaults to `parquet` for paths ending in `.parquet` and `arrow` otherwise.
+
+    Returns:
+        int: The number of rows written.
+    """
+    if format is None:
+        format = 'parquet' if path.endswith('.parquet') else 'arrow'
+    if format == 'parquet':
+        parquet = lazy_import('pyarrow.parquet')
+        writer = parquet.ParquetWriter(path, schema(endpoint))
+    elif format == 'arrow':
+        writer = pa.ipc.new_file(path, schema(endpoint))
+    else:
+        raise ValueError(f"Unknown format '{format}', expected 'parquet' or 'arrow'")
+
+    rows = 0
+    with writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def export_markets(client: KalshiClient, path: str, format: Optional[str] = None, **filters) -> int:
+    """Export every market matching `filters` to `path`, see `write_batches`."""
+    return write_batches(iter_market_batches(client, **filters), path, 'markets', format)
+
+
+def export_trades(client: KalshiClient, path: str, format: Optional[str] = None, **filters) -> int:
+    """Export every trade matching `filters` to `path`, see `write_batches`."""
+    return write_batches(iter_trade_batches(client, **filters), path, 'trades', format)
+
+
+def export_fills(client: KalshiClient, path: str, format: Optional[str] = None, **filters) -> int:
+    """Export every fill matching `filters` to `path`, see `write_batches`."""
+    return write_batches(iter_fill_batches(client, **filters), path, 'fills', format)
+
+
+def export_candlesticks(client: KalshiClient, path: str, ticker: str, series_ticker: str,
+                        start_ts: int, end_ts: int, period_interval: int, format: Optional[str] = None) -> int:
+    """Export a market's candlesticks between `start_ts` and `end_ts` to `path`, see `write_batches`."""
+    batches = iter_candlestick_batches(client, ticker, series_ticker, start_ts, end_ts, period_interval)
+    return write_batches(batches, path, 'candlesticks', format)
+
+
+def read_table(path: str) -> "pa.Table":
+    """Read a file written by `write_batches` back into an Arrow table."""
+    if path.endswith('.parquet'):
+        return lazy_import('pyarrow.parquet').read_table(path)
+    with pa.memory_map(path) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def load_candlesticks(path: str) -> List[Dict[str, Any]]:
+    """
+    Load exported candlesticks as the list of dicts the functions in technical.py take,
+    e.g. `calculate_rsi(load_candlesticks('candles.parquet'))`.
+    """
+    return read_table(path).to_pylist()
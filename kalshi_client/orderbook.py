@@ -0,0 +1,235 @@
+from itertools import chain
+import numpy as np
+
+
+"""
+Vectorized analytics over many orderbooks at once.
+
+Books are packed into a dense array of shape (markets, 99, 2), where
+levels[m, p - 1, YES] is the resting yes quantity bid at p cents for
+market m and levels[m, p - 1, NO] is the same for the no side. Kalshi
+only shows bids, so a no bid at p cents is a yes ask at 100 - p cents.
+Every metric below is computed for all markets in a single pass.
+"""
+
+YES = 0
+NO = 1
+NUM_LEVELS = 99
+
+_SIDES = {'yes': YES, 'no': NO}
+_PRICES = np.arange(1, NUM_LEVELS + 1, dtype=np.int64)
+
+
+def _side_levels(side):
+    """
+    Normalize one side of a book to a list of (price, quantity) pairs.
+
+    :param side: Either the `[[price, quantity], ...]` list returned by
+        `get_orderbook`, a locally maintained `{price: quantity}` dict, or None
+    :return: List of (price, quantity) pairs
+    """
+    if not side:
+        return []
+    if isinstance(side, dict):
+        return list(side.items())
+    return side
+
+
+def pack_orderbooks(orderbooks):
+    """
+    Pack many orderbooks into a dense (markets, 99, 2) quantity array.
+
+    :param orderbooks: Mapping of ticker to book, or a list of books. Each book
+        may be a raw `get_orderbook` response, its inner `orderbook` dict, or a
+        locally maintained `{'yes': {price: qty}, 'no': {price: qty}}` dict
+    :return: List of tickers (or indices for a list input) and the packed array
+    """
+    if isinstance(orderbooks, dict):
+        tickers = list(orderbooks.keys())
+        books = list(orderbooks.values())
+    else:
+        books = list(orderbooks)
+        tickers = list(range(len(books)))
+
+    # Collect every side's levels, then flatten them into one array in a single pass
+    side_levels = []
+    for book in books:
+        book = book.get('orderbook', book)
+        side_levels.append(_side_levels(book.get('yes')))
+        side_levels.append(_side_levels(book.get('no')))
+    counts = np.fromiter(map(len, side_levels), dtype=np.int64, count=len(side_levels))
+    flat = np.fromiter(chain.from_iterable(chain.from_iterable(side_levels)),
+                       dtype=np.int64, count=2 * int(counts.sum())).reshape(-1, 2)
+    prices, quantities = flat[:, 0], flat[:, 1]
+    # Side list i belongs to book i // 2, on side i % 2
+    owners = np.repeat(np.arange(len(side_levels)), counts)
+
+    invalid = (prices < 1) | (prices > NUM_LEVELS)
+    if invalid.any():
+        first = np.argmax(invalid)
+        name = 'yes' if owners[first] % 2 == YES else 'no'
+        raise ValueError(f"Book {tickers[owners[first] // 2]!r} has a {name} level at {prices[first]} cents, "
+                         f"prices must be between 1 and {NUM_LEVELS}")
+
+    # Stored side-major, so reductions over the price levels of a side run over contiguous memory
+    levels = np.zeros((len(books), 2, NUM_LEVELS), dtype=np.int64).transpose(0, 2, 1)
+    levels[owners // 2, prices - 1, owners % 2] = quantities
+    return tickers, levels
+
+
+def best_bids(levels):
+    """
+    Find the best (highest) bid on each side of every book.
+
+    :param levels: Packed array from `pack_orderbooks`
+    :return: Best bid prices and quantities, each of shape (markets, 2).
+        Prices are NaN and quantities are 0 where a side is empty
+    """
+    resting = levels > 0
+    # Index of the highest resting level, found by searching from the top
+    top = NUM_LEVELS - 1 - np.argmax(resting[:, ::-1, :], axis=1)
+    has_bid = resting.any(axis=1)
+    prices = np.where(has_bid, top + 1, np.nan)
+    quantities = np.take_along_axis(levels, top[:, None, :], axis=1)[:, 0, :]
+    quantities = np.where(has_bid, quantities, 0)
+    return prices, quantities
+
+
+def calculate_spread(levels):
+    """
+    Calculate the yes bid/ask spread of every book.
+
+    :param levels: Packed array from `pack_orderbooks`
+    :return: Spread in cents, NaN where either side is empty
+    """
+    prices, _ = best_bids(levels)
+    return (100 - prices[:, NO]) - prices[:, YES]
+
+
+def calculate_mid(levels):
+    """
+    Calculate the yes mid price of every book.
+
+    :param levels: Packed array from `pack_orderbooks`
+    :return: Mid price in cents, NaN where either side is empty
+    """
+    prices, _ = best_bids(levels)
+    return (prices[:, YES] + (100 - prices[:, NO])) / 2
+
+
+def calculate_microprice(levels):
+    """
+    Calculate the yes microprice of every book, i.e. the top of book prices
+    weighted by the quantity resting on the opposite side.
+
+    :param levels: Packed array from `pack_orderbooks`
+    :return: Microprice in cents, NaN where either side is empty
+    """
+    return _microprice(*best_bids(levels))
+
+
+def calculate_imbalance(levels, depth=None):
+    """
+    Calculate the order imbalance of every book, from -1 (all no) to 1 (all yes).
+
+    :param levels: Packed array from `pack_orderbooks`
+    :param depth: Number of levels from the top of each side to include.
+        Uses only the best level when 1 and the whole book when None (default)
+    :return: Imbalance, NaN where both sides are empty
+    """
+    return _imbalance(_depth_mask(levels, depth))
+
+
+def calculate_depth_weighted_mid(levels, depth=None):
+    """
+    Calculate the yes mid price of every book using the volume weighted
+    average price of each side instead of the top of book.
+
+    :param levels: Packed array from `pack_orderbooks`
+    :param depth: Number of levels from the top of each side to include.
+        Uses the whole book when None (default)
+    :return: Depth weighted mid in cents, NaN where either side is empty
+    """
+    return _depth_weighted_mid(_depth_mask(levels, depth))
+
+
+def calculate_cost_to_fill(levels, count, side='yes'):
+    """
+    Calculate the cost of buying `count` contracts of `side` in every book
+    by sweeping the resting bids of the opposite side.
+
+    :param levels: Packed array from `pack_orderbooks`
+    :param count: Number of contracts to buy
+    :param side: Side to buy, either 'yes' or 'no' (default is 'yes')
+    :return: Total cost in cents, NaN where the book cannot fill `count`
+    """
+    # A bid on the opposite side at p is an ask at 100 - p, so reversing
+    # the opposite side gives the asks ordered from cheapest to dearest
+    asks = levels[:, ::-1, 1 - _SIDES[side]]
+    filled_before = np.cumsum(asks, axis=1) - asks
+    taken = np.clip(count - filled_before, 0, asks)
+    cost = (taken @ _PRICES).astype(np.float64)
+    return np.where(taken.sum(axis=1) >= count, cost, np.nan)
+
+
+def orderbook_metrics(levels, fill_count=None, depth=None):
+    """
+    Calculate every metric in this module for every book in one call.
+
+    :param levels: Packed array from `pack_orderbooks`
+    :param fill_count: If provided, also includes the cost to buy this many yes and no contracts
+    :param depth: Depth passed to the imbalance and depth weighted mid calculations
+    :return: Dictionary of metric name to array of shape (markets,)
+    """
+    # Shared by several metrics, so each is only computed once
+    prices, quantities = best_bids(levels)
+    masked = _depth_mask(levels, depth)
+    bid, ask = prices[:, YES], 100 - prices[:, NO]
+
+    metrics = {
+        'yes_bid': bid,
+        'yes_ask': ask,
+        'spread': ask - bid,
+        'mid': (bid + ask) / 2,
+        'microprice': _microprice(prices, quantities),
+        'imbalance': _imbalance(masked),
+        'depth_weighted_mid': _depth_weighted_mid(masked),
+    }
+    if fill_count is not None:
+        metrics['yes_cost_to_fill'] = calculate_cost_to_fill(levels, fill_count, 'yes')
+        metrics['no_cost_to_fill'] = calculate_cost_to_fill(levels, fill_count, 'no')
+    return metrics
+
+
+def _microprice(prices, quantities):
+    bid, ask = prices[:, YES], 100 - prices[:, NO]
+    bid_qty, ask_qty = quantities[:, YES], quantities[:, NO]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (bid * ask_qty + ask * bid_qty) / (bid_qty + ask_qty)
+
+
+def _imbalance(masked):
+    totals = masked.sum(axis=1).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (totals[:, YES] - totals[:, NO]) / (totals[:, YES] + totals[:, NO])
+
+
+def _depth_weighted_mid(masked):
+    totals = masked.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vwap = np.einsum('mps,p->ms', masked, _PRICES) / totals
+    return (vwap[:, YES] + (100 - vwap[:, NO])) / 2
+
+
+def _depth_mask(levels, depth):
+    """
+    Zero out every level more than `depth` levels below the best bid of its side.
+    """
+    if depth is None:
+        return levels
+    # Rank each resting level from the top of its side, starting at 1. Works on
+    # the side-major view so the result keeps the layout `pack_orderbooks` uses
+    by_side = levels.transpose(0, 2, 1)
+    resting = by_side > 0
+    rank = np.cumsum(resting[:, :, ::-1], axis=2, dtype=np.int8)[:, :, ::-1]
+    return np.where(resting & (rank <= depth), by_side, 0).transpose(0, 2, 1)
@@ -0,0 +1,541 @@
+import heapq
+import time
+from collections import deque
+from datetime import datetime, timezone
+from itertools import count as counter
+from typing import Callable, Dict, List, Optional
+from kalshi_client.client import KalshiClient
+from kalshi_client.http_helpers import HttpError
+
+
+"""
+A local paper trading exchange. Orders are matched with price-time
+priority against books fed from `get_orderbook` data, and PaperClient
+serves the portfolio endpoints of KalshiClient from it instead of the API.
+
+Every book is kept in yes terms: buying yes or selling no is a bid, and
+selling yes or buying no is an ask, with a no price of p being a yes price
+of 100 - p. Liquidity loaded from orderbook data is matched against like any
+other order, but only your own orders produce fills and positions. Your
+orders never trade with each other: a resting order that would is cancelled.
+"""
+
+
+class Order:
+    """An order resting in or matched by the engine. Prices are in yes terms."""
+    __slots__ = ('order_id', 'client_order_id', 'ticker', 'side', 'action', 'type',
+                 'is_bid', 'price', 'place_count', 'remaining', 'decrease_count',
+                 'status', 'created_ts', 'is_user')
+
+    def __init__(self, order_id, client_order_id, ticker, side, action, type,
+                 is_bid, price, count, created_ts, is_user=True):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.ticker = ticker
+        self.side = side
+        self.action = action
+        self.type = type
+        self.is_bid = is_bid
+        self.price = price
+        self.place_count = count
+        self.remaining = count
+        self.decrease_count = 0
+        self.status = 'resting'
+        self.created_ts = created_ts
+        self.is_user = is_user
+
+    def to_dict(self) -> dict:
+        return {
+            'order_id': self.order_id,
+            'client_order_id': self.client_order_id,
+            'ticker': self.ticker,
+            'side': self.side,
+            'action': self.action,
+            'type': self.type,
+            'status': self.status,
+            'yes_price': self.price,
+            'no_price': 100 - self.price,
+            'place_count': self.place_count,
+            'remaining_count': self.remaining,
+            'fill_count': self.place_count - self.remaining - self.decrease_count,
+            'decrease_count': self.decrease_count,
+            'created_time': _iso_time(self.created_ts),
+        }
+
+
+class Book:
+    """Resting orders of one market, as a FIFO queue per yes price level."""
+    __slots__ = ('bids', 'asks', 'best_bid', 'best_ask')
+
+    def __init__(self):
+        self.bids = [deque() for _ in range(100)]
+        self.asks = [deque() for _ in range(100)]
+        # 0 and 100 mean that side of the book is empty
+        self.best_bid = 0
+        self.best_ask = 100
+
+    def add(self, order: Order) -> None:
+        if order.is_bid:
+            self.bids[order.price].append(order)
+            if order.price > self.best_bid:
+                self.best_bid = order.price
+        else:
+            self.asks[order.price].append(order)
+            if order.price < self.best_ask:
+                self.best_ask = order.price
+
+    def remove(self, order: Order) -> None:
+        levels = self.bids if order.is_bid else self.asks
+        levels[order.price].remove(order)
+        self.refresh_best()
+
+    def refresh_best(self) -> None:
+        self.best_bid = next((p for p in range(99, 0, -1) if self.bids[p]), 0)
+        self.best_ask = next((p for p in range(1, 100) if self.asks[p]), 100)
+
+
+class Position:
+    __slots__ = ('position', 'market_exposure', 'realized_pnl', 'total_traded')
+
+    def __init__(self):
+        self.position = 0
+        self.market_exposure = 0
+        self.realized_pnl = 0
+        self.total_traded = 0
+
+
+class MatchingEngine:
+    """Price-time priority matching engine over yes/no books for a single account."""
+    def __init__(self, balance: int = 0, clock: Optional[Callable[[], float]] = None):
+        """
+        Initializes the MatchingEngine.
+
+        Args:
+            balance (int, optional): Starting balance in cents. Defaults to 0.
+            clock (Optional[Callable[[], float]], optional): Returns the current unix time, replace it to run on simulated time. Defaults to time.time.
+        """
+        self.balance = balance
+        # Cash held back for resting buys, and contracts promised to resting sells per (ticker, side)
+        self.reserved = 0
+        self.committed: Dict[tuple, int] = {}
+        self.clock = clock if clock is not None else time.time
+        self.books: Dict[str, Book] = {}
+        self.event_tickers: Dict[str, str] = {}
+        self.orders: Dict[str, Order] = {}
+        self.client_order_ids: Dict[str, str] = {}
+        self.fills: List[dict] = []
+        self.positions: Dict[str, Position] = {}
+        # (expiration_ts, order_id) of resting orders that expire
+        self.expirations: List[tuple] = []
+        self.order_ids = counter(1)
+        self.trade_ids = counter(1)
+
+    def book(self, ticker: str) -> Book:
+        book = self.books.get(ticker)
+        if book is None:
+            book = self.books[ticker] = Book()
+        return book
+
+    def load_orderbook(self, ticker: str, orderbook: dict, event_ticker: Optional[str] = None) -> None:
+        """
+        Replace the market's liquidity with an orderbook snapshot, keeping your resting orders.
+        Snapshot levels that cross your resting orders fill them at your price.
+
+        Args:
+            ticker (str): The market ticker.
+            orderbook (dict): A `get_orderbook` response or its inner `orderbook` dict.
+            event_ticker (Optional[str], optional): The market's event ticker, used to filter orders and positions by event. Defaults to None.
+        """
+        self.expire_orders()
+        if event_ticker is not None:
+            self.event_tickers[ticker] = event_ticker
+        orderbook = orderbook.get('orderbook', orderbook)
+        book = self.book(ticker)
+        for levels in (book.bids, book.asks):
+            for price, level in enumerate(levels):
+                if level:
+                    levels[price] = deque(order for order in level if order.is_user)
+        book.refresh_best()
+
+        now = self.clock()
+        for price, quantity in orderbook.get('yes') or []:
+            self.submit(Order(None, None, ticker, 'yes', 'buy', 'limit', True, price, quantity, now, False))
+        for price, quantity in orderbook.get('no') or []:
+            self.submit(Order(None, None, ticker, 'no', 'buy', 'limit', False, 100 - price, quantity, now, False))
+
+    def create_order(self, ticker: str, client_order_id: str, side: str, action: str, count: int, type: str,
+                     yes_price: Optional[int] = None, no_price: Optional[int] = None,
+                     expiration_ts: Optional[int] = None) -> Order:
+        """
+        Validate, match and possibly rest an order. Market orders and orders whose
+        `expiration_ts` has already passed are cancelled instead of resting, and
+        resting orders are cancelled once the engine's clock reaches their `expiration_ts`.
+        Raises an HttpError if the order is invalid or cannot be paid for.
+        """
+        self.expire_orders()
+        if side not in ('yes', 'no') or action not in ('buy', 'sell') or type not in ('limit', 'market'):
+            raise HttpError('Bad Request', 400, tip='side must be yes/no, action buy/sell and type limit/market')
+        if count < 1:
+            raise HttpError('Bad Request', 400, tip='count must be at least 1')
+        if client_order_id in self.client_order_ids:
+            raise HttpError('Conflict', 409, tip='client_order_id has already been used')
+
+        is_bid = (side == 'yes') == (action == 'buy')
+        if yes_price is not None:
+            price = yes_price
+        elif no_price is not None:
+            price = 100 - no_price
+        elif type == 'market':
+            price = 99 if is_bid else 1
+        else:
+            raise HttpError('Bad Request', 400, tip='Limit orders need a yes_price or no_price')
+        if not 1 <= price <= 99:
+            raise HttpError('Bad Request', 400, tip='Prices must be between 1 and 99 cents')
+
+        # Buys reserve their full cost until they fill or are cancelled. Sells must be
+        # covered by contracts held on that side that no other resting sell has promised
+        if action == 'buy':
+            cost = count * (price if side == 'yes' else 100 - price)
+            if cost > self.balance - self.reserved:
+                raise HttpError('Bad Request', 400, tip='Insufficient balance')
+            self.reserved += cost
+        else:
+            position = self.positions.get(ticker)
+            held = 0 if position is None else position.position if side == 'yes' else -position.position
+            if count > held - self.committed.get((ticker, side), 0):
+                raise HttpError('Bad Request', 400, tip='Cannot sell more contracts than are held')
+            self.committed[(ticker, side)] = self.committed.get((ticker, side), 0) + count
+
+        now = self.clock()
+        order = Order(f'paper-{next(self.order_ids)}', client_order_id, ticker, side, action, type,
+                      is_bid, price, count, now)
+        self.orders[order.order_id] = order
+        self.client_order_ids[client_order_id] = order.order_id
+        immediate = type == 'market' or (expiration_ts is not None and expiration_ts <= now)
+        self.submit(order, rest=not immediate)
+        if expiration_ts is not None and order.status == 'resting':
+            heapq.heappush(self.expirations, (expiration_ts, order.order_id))
+        return order
+
+    def expire_orders(self) -> None:
+        """Cancel every resting order whose `expiration_ts` the engine's clock has reached."""
+        now = self.clock()
+        while self.expirations and self.expirations[0][0] <= now:
+            _, order_id = heapq.heappop(self.expirations)
+            order = self.orders[order_id]
+            if order.status == 'resting':
+                self.decrease_order(order_id, order.remaining)
+
+    def submit(self, order: Order, rest: bool = True) -> None:
+        """Match an order against the opposite side of its book and rest what is left."""
+        book = self.book(order.ticker)
+        if order.is_bid:
+            while order.remaining and book.best_ask <= order.price:
+                self.match_level(book.asks[book.best_ask], order, book.best_ask)
+                if not book.asks[book.best_ask]:
+                    book.best_ask = next((p for p in range(book.best_ask + 1, 100) if book.asks[p]), 100)
+        else:
+            while order.remaining and book.best_bid >= order.price:
+                self.match_level(book.bids[book.best_bid], order, book.best_bid)
+                if not book.bids[book.best_bid]:
+                    book.best_bid = next((p for p in range(book.best_bid - 1, 0, -1) if book.bids[p]), 0)
+
+        if not order.remaining:
+            order.status = 'executed'
+        elif rest:
+            book.add(order)
+        else:
+            self.release(order, order.remaining)
+            order.decrease_count += order.remaining
+            order.remaining = 0
+            order.status = 'canceled'
+
+    def match_level(self, level: deque, taker: Order, price: int) -> None:
+        while level and taker.remaining:
+            maker = level[0]
+            # Self-trade prevention: your resting order is cancelled instead of trading with you
+            if maker.is_user and taker.is_user:
+                level.popleft()
+                self.release(maker, maker.remaining)
+                maker.decrease_count += maker.remaining
+                maker.remaining = 0
+                maker.status = 'canceled'
+                continue
+            filled = min(maker.remaining, taker.remaining)
+            maker.remaining -= filled
+            taker.remaining -= filled
+            if not maker.remaining:
+                maker.status = 'executed'
+                level.popleft()
+            if maker.is_user:
+                self.record_fill(maker, price, filled, is_taker=False)
+            if taker.is_user:
+                self.record_fill(taker, price, filled, is_taker=True)
+
+    def release(self, order: Order, count: int) -> None:
+        """Give back what a user order reserved for `count` contracts that will no longer be placed."""
+        if order.action == 'buy':
+            self.reserved -= count * (order.price if order.side == 'yes' else 100 - order.price)
+        else:
+            self.committed[(order.ticker, order.side)] -= count
+
+    def record_fill(self, order: Order, price: int, filled: int, is_taker: bool) -> None:
+        self.release(order, filled)
+        position = self.positions.get(order.ticker)
+        if position is None:
+            position = self.positions[order.ticker] = Position()
+
+        # Buying yes opens longs and closes shorts, the reverse for selling yes.
+        # A short yes position is held as no contracts, which cost 100 - price each
+        if order.is_bid:
+            held = -position.position
+            open_price, close_price = price, 100 - price
+        else:
+            held = position.position
+            open_price, close_price = 100 - price, price
+        closed = min(filled, max(held, 0))
+        opened = filled - closed
+
+        if closed:
+            basis = position.market_exposure * closed // held
+            position.market_exposure -= basis
+            position.realized_pnl += closed * close_price - basis
+        position.market_exposure += opened * open_price
+        self.balance += closed * close_price - opened * open_price
+        position.position += filled if order.is_bid else -filled
+        position.total_traded += filled * (price if order.side == 'yes' else 100 - price)
+
+        now = self.clock()
+        self.fills.append({
+            'trade_id': f'paper-{next(self.trade_ids)}',
+            'order_id': order.order_id,
+            'ticker': order.ticker,
+            'side': order.side,
+            'action': order.action,
+            'count': filled,
+            'yes_price': price,
+            'no_price': 100 - price,
+            'is_taker': is_taker,
+            'created_time': _iso_time(now),
+            'ts': int(now),
+        })
+
+    def get_order(self, order_id: str) -> Order:
+        order = self.orders.get(order_id)
+        if order is None:
+            raise HttpError('Not Found', 404, tip='Check the order id')
+        return order
+
+    def decrease_order(self, order_id: str, reduce_by: int) -> Order:
+        """Reduce a resting order's remaining count, cancelling it when nothing is left."""
+        order = self.get_order(order_id)
+        if order.status != 'resting':
+            raise HttpError('Bad Request', 400, tip='Only resting orders can be decreased')
+        if reduce_by < 1:
+            raise HttpError('Bad Request', 400, tip='reduce_by must be at least 1')
+        reduce_by = min(reduce_by, order.remaining)
+        self.release(order, reduce_by)
+        order.remaining -= reduce_by
+        order.decrease_count += reduce_by
+        if not order.remaining:
+            order.status = 'canceled'
+            self.book(order.ticker).remove(order)
+        return order
+
+    def cancel_order(self, order_id: str) -> int:
+        """Cancel a resting order and return the number of contracts it was reduced by."""
+        order = self.get_order(order_id)
+        reduced_by = order.remaining
+        self.decrease_order(order_id, reduced_by)
+        return reduced_by
+
+    def event_ticker(self, ticker: str) -> Optional[str]:
+        return self.event_tickers.get(ticker)
+
+    def resting_orders_count(self, ticker: str) -> int:
+        book = self.books.get(ticker)
+        if book is None:
+            return 0
+        return sum(order.is_user for levels in (book.bids, book.asks) for level in levels for order in level)
+
+
+class PaperClient(KalshiClient):
+    """A KalshiClient whose portfolio endpoints are served by a local MatchingEngine.
+
+    Market data endpoints still go through the client's transport, so pairing it
+    with a ReplayTransport runs whole strategies offline. Use `sync_orderbook` to
+    feed the engine from `get_orderbook`, or `engine.load_orderbook` for other data.
+    """
+    def __init__(self,
+                 key_id: Optional[str] = None,
+                 private_key=None,
+                 engine: Optional[MatchingEngine] = None,
+                 balance: int = 0,
+                 **kwargs):
+        """
+        Initializes the PaperClient.
+
+        Args:
+            key_id (Optional[str], optional): The key id, only needed for live market data.
+            private_key (optional): The private key, only needed for live market data.
+            engine (Optional[MatchingEngine], optional): The engine to trade against. Defaults to a new engine.
+            balance (int, optional): Starting balance in cents when a new engine is created. Defaults to 0.
+            **kwargs: Passed on to KalshiClient, e.g. `transport`.
+        """
+        super().__init__(key_id, private_key, **kwargs)
+        self.engine = engine if engine is not None else MatchingEngine(balance)
+
+    def sync_orderbook(self, ticker: str, depth: Optional[int] = None) -> None:
+        """Load the market's current orderbook from `get_orderbook` into the engine."""
+        self.engine.load_orderbook(ticker, self.get_orderbook(ticker, depth))
+
+    # portfolio endpoints!
+
+    def get_balance(self,):
+        self.engine.expire_orders()
+        # Like the exchange, cash held back for resting buys is not available
+        return {'balance': self.engine.balance - self.engine.reserved}
+
+    def create_order(self,
+                 ticker: str,
+                 client_order_id: str,
+                 side: str,
+                 action: str,
+                 count: int,
+                 type: str,
+                 yes_price: Optional[int] = None,
+                 no_price: Optional[int] = None,
+                 expiration_ts: Optional[int] = None,
+                 sell_position_floor: Optional[int] = None,
+                 buy_max_cost: Optional[int] = None,
+                 ):
+        # sell_position_floor and buy_max_cost are accepted but not simulated
+        order = self.engine.create_order(ticker, client_order_id, side, action, count, type,
+                                         yes_price, no_price, expiration_ts)
+        return {'order': order.to_dict()}
+
+    def batch_create_orders(self,
+                                orders:list
+        ):
+        results = []
+        for order in orders:
+            unknown = order.keys() - _ORDER_FIELDS
+            missing = _REQUIRED_ORDER_FIELDS - order.keys()
+            if unknown or missing:
+                message = f'Unsupported fields {sorted(unknown)}' if unknown else f'Missing fields {sorted(missing)}'
+                results.append({'order': None, 'error': {'code': 400, 'message': message}})
+                continue
+            try:
+                results.append({'order': self.create_order(**order)['order'], 'error': None})
+            except HttpError as e:
+                results.append({'order': None, 'error': {'code': e.status, 'message': e.tip}})
+        return {'orders': results}
+
+    def decrease_order(self,
+                        order_id:str,
+                        reduce_by:int,
+                        ):
+        return {'order': self.engine.decrease_order(order_id, reduce_by).to_dict()}
+
+    def cancel_order(self,
+                        order_id:str
+                        ):
+        reduced_by = self.engine.cancel_order(order_id)
+        return {'order': self.engine.get_order(order_id).to_dict(), 'reduced_by': reduced_by}
+
+    def batch_cancel_orders(self,
+                                order_ids:list
+        ):
+        return {'orders': [self.cancel_order(order_id) for order_id in order_ids]}
+
+    def get_fills(self,
+                        ticker:Optional[str]=None,
+                        order_id:Optional[str]=None,
+                        min_ts:Optional[int]=None,
+                        max_ts:Optional[int]=None,
+                        limit:Optional[int]=None,
+                        cursor:Optional[str]=None):
+        fills = [
+            fill for fill in reversed(self.engine.fills)
+            if (ticker is None or fill['ticker'] == ticker)
+            and (order_id is None or fill['order_id'] == order_id)
+            and (min_ts is None or fill['ts'] >= min_ts)
+            and (max_ts is None or fill['ts'] <= max_ts)
+        ]
+        fills, cursor = _page(fills, limit, cursor)
+        return {'fills': fills, 'cursor': cursor}
+
+    def get_orders(self,
+                        ticker:Optional[str]=None,
+                        event_ticker:Optional[str]=None,
+                        min_ts:Optional[int]=None,
+                        max_ts:Optional[int]=None,
+                        limit:Optional[int]=None,
+                        cursor:Optional[str]=None
+                        ):
+        self.engine.expire_orders()
+        orders = [
+            order for order in reversed(self.engine.orders.values())
+            if (ticker is None or order.ticker == ticker)
+            and (event_ticker is None or self.engine.event_ticker(order.ticker) == event_ticker)
+            and (min_ts is None or order.created_ts >= min_ts)
+            and (max_ts is None or order.created_ts <= max_ts)
+        ]
+        orders, cursor = _page(orders, limit, cursor)
+        return {'orders': [order.to_dict() for order in orders], 'cursor': cursor}
+
+    def get_order(self,
+                    order_id:str):
+        self.engine.expire_orders()
+        return {'order': self.engine.get_order(order_id).to_dict()}
+
+    def get_positions(self,
+                  limit: Optional[int] = None,
+                  cursor: Optional[str] = None,
+                  settlement_status: Optional[str] = None,
+                  ticker: Optional[str] = None,
+                  event_ticker: Optional[str] = None,
+                  count_filter: Optional[str] = None):
+        self.engine.expire_orders()
+        # Nothing settles in the engine, so settlement_status is ignored
+        market_positions = []
+        for market, position in self.engine.positions.items():
+            if ticker is not None and market != ticker:
+                continue
+            if event_ticker is not None and self.engine.event_ticker(market) != event_ticker:
+                continue
+            entry = {
+                'ticker': market,
+                'position': position.position,
+                'market_exposure': position.market_exposure,
+                'realized_pnl': position.realized_pnl,
+                'total_traded': position.total_traded,
+                'resting_orders_count': self.engine.resting_orders_count(market),
+                'fees_paid': 0,
+            }
+            if count_filter:
+                fields = [field.strip() for field in count_filter.split(',')]
+                fields = ['resting_orders_count' if field == 'resting_order_count' else field for field in fields]
+                if not any(entry.get(field) for field in fields):
+                    continue
+            market_positions.append(entry)
+
+        market_positions, cursor = _page(market_positions, limit, cursor)
+        return {'market_positions': market_positions, 'event_positions': [], 'cursor': cursor}
+
+
+# Fields create_order accepts, and the ones it requires, for validating batches
+_ORDER_FIELDS = frozenset(('ticker', 'client_order_id', 'side', 'action', 'count', 'type', 'yes_price',
+                           'no_price', 'expiration_ts', 'sell_position_floor', 'buy_max_cost'))
+_REQUIRED_ORDER_FIELDS = frozenset(('ticker', 'client_order_id', 'side', 'action', 'count', 'type'))
+
+
+def _page(items: list, limit: Optional[int], cursor: Optional[str]):
+    """Split a list into the page selected by `limit` and `cursor`, and the cursor of the next page."""
+    start = int(cursor) if cursor else 0
+    end = start + (limit or 100)
+    return items[start:end], str(end) if end < len(items) else ''
+
+
+def _iso_time(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat().replace('+00:00', 'Z')
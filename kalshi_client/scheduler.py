@@ -0,0 +1,211 @@
+import hashlib
+import heapq
+import json
+import time
+from datetime import datetime
+from itertools import count as counter
+from typing import Any, Callable, Dict, List, Optional
+from kalshi_client.client import KalshiClient
+
+
+class Subscription:
+    """A polled endpoint, with the interval it is currently polled at and the last response seen."""
+    def __init__(self, kind: str, ticker: Optional[str], callback: Callable, params: Dict[str, Any], interval: float):
+        self.kind = kind
+        self.ticker = ticker
+        self.callback = callback
+        self.params = params
+        self.interval = interval
+        self.digest: Optional[bytes] = None
+        self.payload: Any = None
+        self.active = True
+
+
+class PollingScheduler:
+    """Polls subscribed endpoints within the client's rate limit, spending more of it where data changes.
+
+    Subscriptions sit in a priority queue ordered by when they are next due. Every
+    response is hashed, and subscribers are only called with a diff when it changed.
+    A change halves a subscription's interval and an unchanged response grows it,
+    and markets close to their close time are polled at least every
+    `close_fraction` of the time left, so hot markets get fresher data from the
+    same request budget.
+    """
+    def __init__(self,
+                 client: KalshiClient,
+                 rate_limit: Optional[float] = None,
+                 min_interval: float = 1.0,
+                 max_interval: float = 60.0,
+                 backoff: float = 1.5,
+                 close_fraction: float = 0.1,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initializes the PollingScheduler.
+
+        Args:
+            client (KalshiClient): The client used to poll.
+            rate_limit (Optional[float], optional): Maximum polls per second. Defaults to the client's rate limit.
+            min_interval (float, optional): Shortest interval a subscription is polled at, in seconds. Defaults to 1.
+            max_interval (float, optional): Longest interval a subscription is polled at, in seconds. Defaults to 60.
+            backoff (float, optional): Factor an interval grows by after an unchanged response or a failed poll. Defaults to 1.5.
+            close_fraction (float, optional): Fraction of the time left until a market closes that its subscriptions are polled within. Defaults to 0.1.
+            clock (Callable[[], float], optional): Returns the current unix time. Defaults to time.time.
+            sleep (Callable[[float], None], optional): Sleeps for a number of seconds. Defaults to time.sleep.
+        """
+        self.client = client
+        self.threshold = 1 / rate_limit if rate_limit else client.threshold
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.close_fraction = close_fraction
+        self.clock = clock
+        self.sleep = sleep
+        self.queue: List[tuple] = []
+        self.sequence = counter()
+        self.close_times: Dict[str, float] = {}
+        self.last_poll = float('-inf')
+        self.running = False
+        self.pollers = {
+            'market': lambda sub: client.get_market(sub.ticker),
+            'orderbook': lambda sub: client.get_orderbook(sub.ticker, **sub.params),
+            'positions': lambda sub: client.get_positions(ticker=sub.ticker, **sub.params),
+        }
+
+    def subscribe(self,
+                  kind: str,
+                  callback: Callable[[Subscription, dict, Any], None],
+                  ticker: Optional[str] = None,
+                  interval: Optional[float] = None,
+                  **params) -> Subscription:
+        """
+        Start polling an endpoint. The first poll is due immediately.
+
+        Args:
+            kind (str): The endpoint to poll, one of `market`, `orderbook` or `positions`.
+            callback (Callable): Called with the subscription, the diff (see `diff_payloads`) and the full response whenever the response changes.
+            ticker (Optional[str], optional): The market ticker. Required for `market` and `orderbook`, optional for `positions`. Defaults to None.
+            interval (Optional[float], optional): Starting poll interval in seconds. Defaults to `min_interval`.
+            **params: Extra query parameters for the endpoint, e.g. `depth` for `orderbook`.
+
+        Returns:
+            Subscription: The subscription, which can be passed to `unsubscribe`.
+        """
+        if kind not in self.pollers:
+            raise ValueError(f"Unknown subscription kind '{kind}', expected one of {list(self.pollers)}")
+        if ticker is None and kind != 'positions':
+            raise ValueError(f"A ticker is required for '{kind}' subscriptions")
+        subscription = Subscription(kind, ticker, callback, params, interval or self.min_interval)
+        self.schedule(subscription, self.clock())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        # Inactive subscriptions are dropped when they reach the front of the queue
+        subscription.active = False
+
+    def schedule(self, subscription: Subscription, due: float) -> None:
+        heapq.heappush(self.queue, (due, next(self.sequence), subscription))
+
+    def step(self) -> Optional[Subscription]:
+        """
+        Wait for the next subscription to be due and within the rate limit, then poll it.
+        Errors raised while polling propagate, but the subscription stays scheduled.
+
+        Returns:
+            Subscription: The polled subscription, or None if there is nothing to poll.
+        """
+        while self.queue and not self.queue[0][2].active:
+            heapq.heappop(self.queue)
+        if not self.queue:
+            return None
+
+        due, _, subscription = heapq.heappop(self.queue)
+        wait = max(due, self.last_poll + self.threshold) - self.clock()
+        if wait > 0:
+            self.sleep(wait)
+        self.last_poll = self.clock()
+        polled = False
+        try:
+            self.poll(subscription)
+            polled = True
+        finally:
+            # A failed poll is retried after backing off, before its error propagates
+            if not polled:
+                subscription.interval = min(self.max_interval, subscription.interval * self.backoff)
+            if subscription.active:
+                self.schedule(subscription, self.last_poll + self.next_interval(subscription))
+        return subscription
+
+    def poll(self, subscription: Subscription) -> None:
+        payload = self.pollers[subscription.kind](subscription)
+        digest = hashlib.blake2b(json.dumps(payload, sort_keys=True, default=str).encode(), digest_size=16).digest()
+        changed = digest != subscription.digest
+
+        if subscription.kind == 'market':
+            self.update_close_time(subscription.ticker, payload.get('market', {}))
+        if changed:
+            diff = diff_payloads(subscription.payload or {}, payload)
+            subscription.digest, subscription.payload = digest, payload
+            subscription.interval = max(self.min_interval, subscription.interval / 2)
+            subscription.callback(subscription, diff, payload)
+        else:
+            subscription.interval = min(self.max_interval, subscription.interval * self.backoff)
+
+    def next_interval(self, subscription: Subscription) -> float:
+        interval = subscription.interval
+        close_time = self.close_times.get(subscription.ticker)
+        if close_time is not None:
+            remaining = close_time - self.clock()
+            if remaining > 0:
+                interval = min(interval, max(self.min_interval, remaining * self.close_fraction))
+        return interval
+
+    def update_close_time(self, ticker: str, market: dict) -> None:
+        if market.get('close_ts'):
+            self.close_times[ticker] = float(market['close_ts'])
+        elif market.get('close_time'):
+            close_time = datetime.fromisoformat(market['close_time'].replace('Z', '+00:00'))
+            self.close_times[ticker] = close_time.timestamp()
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """
+        Poll until `stop` is called, there is nothing left to poll, or `duration` seconds pass.
+        """
+        end = self.clock() + duration if duration is not None else None
+        self.running = True
+        while self.running and (end is None or self.clock() < end):
+            if self.step() is None:
+                break
+        self.running = False
+
+    def stop(self) -> None:
+        self.running = False
+
+
+def diff_payloads(old: Any, new: Any, prefix: str = '') -> Dict[str, Any]:
+    """
+    Find what changed between two responses.
+
+    Args:
+        old (Any): The previous response, or an empty dict for the first one.
+        new (Any): The current response.
+        prefix (str, optional): Path prefix used while recursing. Defaults to ''.
+
+    Returns:
+        dict: Dotted paths of changed fields mapped to their new values. Nested
+        dictionaries are compared field by field, everything else as a whole,
+        and removed fields map to None.
+    """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return {} if old == new else {prefix: new}
+
+    diff = {}
+    for key, value in new.items():
+        path = f'{prefix}.{key}' if prefix else key
+        if key not in old:
+            diff[path] = value
+        elif old[key] != value:
+            diff.update(diff_payloads(old[key], value, path))
+    for key in old.keys() - new.keys():
+        diff[f'{prefix}.{key}' if prefix else key] = None
+    return diff
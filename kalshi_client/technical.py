@@ -1,4 +1,7 @@
-import pandas as pd
+from kalshi_client.utils import lazy_import
+
+# pandas is only loaded the first time an indicator is calculated
+pd = lazy_import('pandas')
 
 
 """
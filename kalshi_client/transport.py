@@ -0,0 +1,172 @@
+import gzip
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+from kalshi_client.utils import lazy_import
+
+# requests is only loaded once the first live request is sent
+requests = lazy_import('requests')
+
+
+class Transport(ABC):
+    """Sends requests for a Connector. Subclass this and implement `request` to change how requests are made."""
+
+    # Live transports hit the network, so the Connector signs and rate limits their requests
+    live = True
+
+    def __init__(self):
+        self.headers: Dict[str, str] = {}
+
+    @abstractmethod
+    def request(self,
+                method: str,
+                url: str,
+                headers: Optional[Dict[str, str]] = None,
+                params: Optional[Dict[str, Any]] = None,
+                data: Optional[str] = None) -> Any:
+        """Sends a request and returns an object with `status_code`, `reason` and `json()`."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SessionTransport(Transport):
+    """Default transport, sends requests through a requests session.
+    Unless one is passed in, the session is created when the first request is sent."""
+    def __init__(self, session: Optional["requests.Session"] = None):
+        self._session = session
+        self.headers = session.headers if session is not None else {}
+
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers.update(self.headers)
+            self.headers = self._session.headers
+        return self._session
+
+    def request(self, method, url, headers=None, params=None, data=None):
+        return self.session.request(method, url, headers=headers, params=params, data=data)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+class RecordedResponse:
+    """A response served from an archive, exposing the parts of requests.Response the Connector uses."""
+    def __init__(self, status_code: int, reason: str, body: Any):
+        self.status_code = status_code
+        self.reason = reason
+        self.body = body
+
+    def json(self) -> Any:
+        return self.body
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]] = None, data: Optional[str] = None) -> str:
+    """
+    Build the key a request is stored under in an archive.
+    Signatures and timestamps are left out so that replays match recordings, and
+    query parameters from the URL and `params` are merged and sorted so the same
+    request always gets the same key however its query was built.
+    """
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != 'self']
+    query += [(str(k), str(v)) for k, v in (params or {}).items() if v is not None]
+    return json.dumps([method, urlunsplit(parts._replace(query='')), sorted(query), data])
+
+
+class RecordingTransport(Transport):
+    """Sends requests through another transport and saves every request/response pair to an archive.
+
+    The archive is a gzip compressed file with one line per request, holding the
+    request's key (see `request_key`) and its response, in the order they were made.
+    Every line is flushed as soon as it is written, so an archive cut short by a
+    crash still replays everything recorded up to that point.
+    """
+    def __init__(self, path: str, transport: Optional[Transport] = None):
+        super().__init__()
+        self.path = path
+        self.transport = transport if transport is not None else SessionTransport()
+        self.headers = self.transport.headers
+        self.live = self.transport.live
+        self.archive = gzip.open(path, 'wb')
+
+    def request(self, method, url, headers=None, params=None, data=None):
+        response = self.transport.request(method, url, headers=headers, params=params, data=data)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+
+        # JSON escapes tabs and newlines, so neither can appear inside the key or response
+        recorded = json.dumps({
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'body': body,
+        })
+        self.archive.write(f'{request_key(method, url, params, data)}\t{recorded}\n'.encode('utf-8'))
+        self.archive.flush()
+        return response
+
+    def close(self) -> None:
+        self.archive.close()
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Serves responses from an archive written by RecordingTransport without touching the network.
+
+    Repeated requests are answered with their recorded responses in order, and the
+    last recorded response is reused once they run out. Requests that were never
+    recorded raise a KeyError. Since nothing is sent, the Connector neither signs
+    nor rate limits replayed requests.
+    """
+    live = False
+
+    def __init__(self, path: str, latency: float = 0.0):
+        """
+        Args:
+            path (str): Path of the archive to replay.
+            latency (float, optional): Seconds to sleep before serving each response, to simulate the network. Defaults to 0.
+        """
+        super().__init__()
+        self.path = path
+        self.latency = latency
+        self.responses: Dict[str, List[bytes]] = {}
+        with gzip.open(path, 'rb') as archive:
+            try:
+                for line in archive:
+                    # Only the last line of an archive cut short by a crash can be incomplete
+                    if not line.endswith(b'\n'):
+                        break
+                    key, recorded = line[:-1].split(b'\t', 1)
+                    self.responses.setdefault(key.decode('utf-8'), []).append(recorded)
+            except EOFError:
+                pass
+        self.served: Dict[str, int] = {}
+
+    def request(self, method, url, headers=None, params=None, data=None):
+        key = request_key(method, url, params, data)
+        if key not in self.responses:
+            raise KeyError(f'No recorded response for {method} {url}')
+        recorded = self.responses[key]
+        position = self.served.get(key, 0)
+        self.served[key] = position + 1
+        if self.latency:
+            time.sleep(self.latency)
+        # Decode on every request so callers never share (and mutate) a response body
+        return RecordedResponse(**json.loads(recorded[min(position, len(recorded) - 1)]))
+
+    def rewind(self) -> None:
+        """Start serving every request's recorded responses from the beginning again."""
+        self.served.clear()
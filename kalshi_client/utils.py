@@ -1,12 +1,47 @@
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
+import importlib.util
+import os
+import sys
+from functools import lru_cache
 
 
-def load_private_key_from_file(file_path):
+def lazy_import(name):
+    """
+    Import a module on first attribute access instead of right away,
+    so heavy dependencies only cost startup time when they are used.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def load_private_key_from_file(file_path, skip_key_validation=False):
+    """
+    Load an RSA private key from a PEM file. Parsing the PEM is slow, so keys
+    are cached until the file changes.
+
+    Validating the key takes most of the load time. Only pass
+    `skip_key_validation=True` for a key you trust, such as your own.
+    """
+    file_path = os.path.realpath(file_path)
+    return _load_private_key(file_path, os.stat(file_path).st_mtime_ns, skip_key_validation)
+
+
+@lru_cache(maxsize=None)
+def _load_private_key(file_path, mtime_ns, skip_key_validation):
+    from cryptography.hazmat.primitives import serialization
+
     with open(file_path, "rb") as key_file:
         private_key = serialization.load_pem_private_key(
             key_file.read(),
             password=None,  # or provide a password if your key is encrypted
-            backend=default_backend()
+            unsafe_skip_rsa_key_validation=skip_key_validation,
         )
-    return private_key
\ No newline at end of file
+    return private_key
@@ -20,4 +20,8 @@ setup(
         "cryptography==44.0.0",
         "requests==2.32.3"
     ],
+    extras_require={
+        "analytics": ["numpy>=1.20"],
+        "export": ["pyarrow>=12.0"],
+    },
 )